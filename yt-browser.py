@@ -1,17 +1,33 @@
 #!/usr/bin/env python3                                                                                                                                          
                                                                                                                                                                 
 import os                                                                                                                                                       
+import atexit                                                                                                                                                   
 import sys                                                                                                                                                      
-import json                                                                                                                                                     
 import time                                                                                                                                                     
+import signal                                                                                                                                                   
 import shutil                                                                                                                                                   
 import subprocess                                                                                                                                               
-import hashlib                                                                                                                                                  
-import argparse                                                                                                                                                 
-import platform                                                                                                                                                 
-import urllib.parse                                                                                                                                             
 import re                                                                                                                                                       
-import shlex                                                                                                                                                    
+import bisect                                                                                                                                                   
+import string                                                                                                                                                   
+from collections import namedtuple, deque                                                                                                                       
+                                                                                                                                                                
+class LazyModule:                                                                                                                                               
+    """Stand-in for a module that is only imported on first attribute access."""                                                                                
+    def __init__(self, name):                                                                                                                                   
+        self._name = name                                                                                                                                       
+                                                                                                                                                                
+    def __getattr__(self, attr):                                                                                                                                
+        __import__(self._name)                                                                                                                                  
+        value = getattr(sys.modules[self._name], attr)                                                                                                          
+        setattr(self, attr, value) # Later lookups skip __getattr__ entirely                                                                                    
+        return value                                                                                                                                            
+                                                                                                                                                                
+# Modules not needed for --version or the first menu draw                                                                                                       
+json = LazyModule("json")                                                                                                                                       
+hashlib = LazyModule("hashlib")                                                                                                                                 
+shlex = LazyModule("shlex")                                                                                                                                     
+urllib_parse = LazyModule("urllib.parse")                                                                                                                       
                                                                                                                                                                 
 # GLOBAL CONFIGURATION & CONSTANTS                                                                                                                              
 CLI_NAME = os.environ.get("YT_X_APP_NAME", "yt-browser")                                                                                                        
@@ -29,10 +45,18 @@ CLI_PREVIEW_IMAGES_CACHE_DIR = os.path.join(CLI_CACHE_DIR, "preview_images")
 CLI_PREVIEW_SCRIPTS_DIR = os.path.join(CLI_CACHE_DIR, "preview_text")                                                                                           
 CLI_HELPER_SCRIPT = os.path.join(CLI_CONFIG_DIR, "yt-x-helper.sh")                                                                                              
 CLI_PREVIEW_DISPATCHER = os.path.join(CLI_CONFIG_DIR, "yt-x-preview.sh")                                                                                        
+CLI_SEARCH_HISTORY_FILE = os.path.join(CLI_CACHE_DIR, "search_history.txt")                                                                                     
                                                                                                                                                                 
 # Platform detection                                                                                                                                            
-uname = platform.uname().system.lower()                                                                                                                         
-PLATFORM = "mac" if "darwin" in uname else ("windows" if "windows" in uname else "linux")                                                                       
+PLATFORM = "mac" if sys.platform == "darwin" else ("windows" if sys.platform.startswith("win") else "linux")                                                    
+                                                                                                                                                                
+# Precompiled patterns used on every menu render                                                                                                                
+NUM_PREFIX_RE = re.compile(r'^[0-9]+ ')                                                                                                                         
+NON_NUM_PREFIX_RE = re.compile(r'^[^0-9]*  ')                                                                                                                   
+MENU_PREFIX_RE = re.compile(r'.*  ')                                                                                                                            
+ANSI_ESCAPE_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')                                                                                           
+HISTORY_REF_RE = re.compile(r'^![0-9]{1,2}$')                                                                                                                   
+FILTER_CMD_RE = re.compile(r'^(:[a-z]+)\s+(.+)')                                                                                                                
                                                                                                                                                                 
 # Default Configuration                                                                                                                                         
 DEFAULT_CONFIG = {                                                                                                                                              
@@ -54,10 +78,22 @@ DEFAULT_CONFIG = {
                                                                                                                                                                 
 CONFIG = DEFAULT_CONFIG.copy()                                                                                                                                  
                                                                                                                                                                 
+# Typed view of CONFIG, parsed once by load_config() and rebuilt via _replace() when a toggle flips                                                             
+RuntimeConfig = namedtuple("RuntimeConfig", ["page_size", "audio_only", "autoplay", "quality", "preview", "selector"])                                          
+RUNTIME_CONFIG = None                                                                                                                                           
+                                                                                                                                                                
 # Runtime State                                                                                                                                                 
 PLAYLIST_START = 1                                                                                                                                              
 PLAYLIST_END = 30                                                                                                                                               
 CURRENT_TIME = int(time.time())                                                                                                                                 
+HASH_CACHE = {}                                                                                                                                                 
+USE_BLAKE2 = True # Set by select_hash(); the bash helper must hash the same way                                                                                
+WHICH_CACHE = {}                                                                                                                                                
+HAS_GUM = False # Set by check_dependencies()                                                                                                                   
+CONFIG_DIRTY = False # CONFIG changed in memory but not yet written                                                                                             
+HISTORY = deque(maxlen=1000) # Search terms, oldest first; loaded once, written by flush_history()                                                              
+HISTORY_DIRTY = False                                                                                                                                           
+RENDERED_PAGES = deque(maxlen=5) # Signatures of recently previewed pages, most recent last                                                                     
                                                                                                                                                                 
 # HELPER FUNCTIONS                                                                                                                                              
 def clear_screen():                                                                                                                                             
@@ -65,12 +101,22 @@ def clear_screen():
     sys.stdout.write("\033c")                                                                                                                                   
     sys.stdout.flush()                                                                                                                                          
                                                                                                                                                                 
+def which(tool):                                                                                                                                                
+    """Memoized shutil.which; PATH doesn't change while we run."""                                                                                              
+    if tool not in WHICH_CACHE: WHICH_CACHE[tool] = shutil.which(tool)                                                                                          
+    return WHICH_CACHE[tool]                                                                                                                                    
+                                                                                                                                                                
 def check_dependencies():                                                                                                                                       
-    """Checks for required tools before running."""                                                                                                             
-    required = ["yt-dlp", "fzf", "jq", "curl"]                                                                                                                  
-    missing = [tool for tool in required if not shutil.which(tool)]                                                                                             
+    """Checks for the tools the current config actually uses (call after load_config)."""                                                                       
+    required = ["yt-dlp", "rofi" if RUNTIME_CONFIG.selector == "rofi" else "fzf"]                                                                               
+    if RUNTIME_CONFIG.preview and RUNTIME_CONFIG.selector == "fzf":                                                                                             
+        required.append("curl") # Thumbnail downloads                                                                                                           
+    missing = [tool for tool in required if not which(tool)]                                                                                                    
                                                                                                                                                                 
-    if not shutil.which("mpv") and not shutil.which("vlc"):                                                                                                     
+    global HAS_GUM                                                                                                                                              
+    HAS_GUM = which("gum") is not None                                                                                                                          
+                                                                                                                                                                
+    if not which("mpv") and not which("vlc"):                                                                                                                   
         missing.append("mpv OR vlc")                                                                                                                            
                                                                                                                                                                 
     if missing:                                                                                                                                                 
@@ -78,10 +124,37 @@ def check_dependencies():
         print("Please install them via your package manager.")                                                                                                  
         sys.exit(1)                                                                                                                                             
                                                                                                                                                                 
-def generate_sha256(text):                                                                                                                                      
+def generate_hash(text):                                                                                                                                        
+    """BLAKE2b-160 (or SHA-256, see select_hash) hex digest of text, memoized since titles repeat across re-renders."""                                         
     if text is None: text = ""                                                                                                                                  
-    if isinstance(text, str): text = text.encode('utf-8')                                                                                                       
-    return hashlib.sha256(text).hexdigest()                                                                                                                     
+    digest = HASH_CACHE.get(text)                                                                                                                               
+    if digest is None:                                                                                                                                          
+        data = text.encode('utf-8') if isinstance(text, str) else text                                                                                          
+        hasher = hashlib.blake2b(data, digest_size=20) if USE_BLAKE2 else hashlib.sha256(data)                                                                  
+        digest = HASH_CACHE[text] = hasher.hexdigest()                                                                                                          
+    return digest                                                                                                                                               
+                                                                                                                                                                
+def select_hash():                                                                                                                                              
+    """Picks the preview-key hash once: BLAKE2b-160 when b2sum exists, else SHA-256. Returns the matching shell command."""                                     
+    global USE_BLAKE2                                                                                                                                           
+    USE_BLAKE2 = which("b2sum") is not None                                                                                                                     
+    HASH_CACHE.clear()                                                                                                                                          
+    if USE_BLAKE2: return """echo -n "$input" | b2sum -l 160 | awk '{print $1}'"""                                                                              
+    if which("sha256sum"): return """echo -n "$input" | sha256sum | awk '{print $1}'"""                                                                         
+    return """echo -n "$input" | shasum -a 256 | awk '{print $1}'"""                                                                                            
+                                                                                                                                                                
+def strip_numbering(title):                                                                                                                                     
+    """Removes the "01 " style index playlist_explorer prefixes to titles."""                                                                                   
+    return NUM_PREFIX_RE.sub('', title) if title[:1].isdigit() else title                                                                                       
+                                                                                                                                                                
+def spawn(cmd, **kwargs):                                                                                                                                       
+    """Starts a fire-and-forget background process in its own session with stdin detached.                                                                      
+                                                                                                                                                                
+    Never pass preexec_fn here: without it subprocess keeps its fast vfork/posix_spawn launch path.                                                             
+    """                                                                                                                                                         
+    kwargs.setdefault("stdin", subprocess.DEVNULL)                                                                                                              
+    kwargs.setdefault("start_new_session", True)                                                                                                                
+    return subprocess.Popen(cmd, **kwargs)                                                                                                                      
                                                                                                                                                                 
 def send_notification(message):                                                                                                                                 
     sys.stderr.write(f"\033[94m[Info]\033[0m {message}\n")                                                                                                      
@@ -91,34 +164,55 @@ def byebye(code=0):
     clear_screen()                                                                                                                                              
     sys.exit(code)                                                                                                                                              
                                                                                                                                                                 
+def remove_stale_files(directory, cutoff):                                                                                                                      
+    """Removes regular files in directory last modified before cutoff."""                                                                                       
+    if not os.path.exists(directory): return                                                                                                                    
+    # DirEntry caches its stat result, so each file costs one syscall rather than two                                                                           
+    with os.scandir(directory) as it:                                                                                                                           
+        for entry in it:                                                                                                                                        
+            if entry.is_file(follow_symlinks=False) and entry.stat().st_mtime < cutoff:                                                                         
+                os.remove(entry.path)                                                                                                                           
+                                                                                                                                                                
 def cleanup_cache():                                                                                                                                            
     """Removes preview images older than 24 hours."""                                                                                                           
     try:                                                                                                                                                        
-        now = time.time()                                                                                                                                       
-        cutoff = now - 86400                                                                                                                                    
-        for d in [CLI_PREVIEW_IMAGES_CACHE_DIR, CLI_PREVIEW_SCRIPTS_DIR]:                                                                                       
-            if not os.path.exists(d): continue                                                                                                                  
-            for filename in os.listdir(d):                                                                                                                      
-                filepath = os.path.join(d, filename)                                                                                                            
-                if os.path.isfile(filepath):                                                                                                                    
-                    if os.path.getmtime(filepath) < cutoff:                                                                                                     
-                        os.remove(filepath)                                                                                                                     
+        cutoff = time.time() - 86400                                                                                                                            
+        remove_stale_files(CLI_PREVIEW_IMAGES_CACHE_DIR, cutoff)                                                                                                
+        remove_stale_files(CLI_PREVIEW_SCRIPTS_DIR, cutoff)                                                                                                     
     except Exception: pass                                                                                                                                      
                                                                                                                                                                 
+def write_script(path, content):                                                                                                                                
+    """Writes an executable script with a single raw write; os.open applies the 0o755 mode on creation."""                                                      
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)                                                                                            
+    try: os.write(fd, content.encode('utf-8'))                                                                                                                  
+    finally: os.close(fd)                                                                                                                                       
+                                                                                                                                                                
+def detect_image_viewer():                                                                                                                                      
+    """Picks the command fzf_preview draws thumbnails with, resolved once instead of on every redraw."""                                                        
+    if CONFIG["IMAGE_RENDERER"] == "icat" or os.environ.get("KITTY_WINDOW_ID"):                                                                                 
+        for tool in ["kitten", "icat"]:                                                                                                                         
+            if which(tool): return tool                                                                                                                         
+        return "kitty"                                                                                                                                          
+    for tool in ["chafa", "imgcat"]:                                                                                                                            
+        if which(tool): return tool                                                                                                                             
+    return ""                                                                                                                                                   
+                                                                                                                                                                
 def create_bash_helpers():                                                                                                                                      
     """Generates the bash scripts needed for fzf preview."""                                                                                                    
+    hash_cmd = select_hash()                                                                                                                                    
+                                                                                                                                                                
     # 1. Helper Functions Script                                                                                                                                
     helper_content = f"""#!/usr/bin/env bash                                                                                                                    
 export CLI_PREVIEW_IMAGES_CACHE_DIR="{CLI_PREVIEW_IMAGES_CACHE_DIR}"                                                                                            
 export CLI_PREVIEW_SCRIPTS_DIR="{CLI_PREVIEW_SCRIPTS_DIR}"                                                                                                      
 export IMAGE_RENDERER="{CONFIG['IMAGE_RENDERER']}"                                                                                                              
+export IMAGE_VIEWER="{detect_image_viewer()}"                                                                                                                   
                                                                                                                                                                 
-generate_sha256() {{                                                                                                                                            
+# Must match generate_hash() in {CLI_NAME}: {"BLAKE2b-160" if USE_BLAKE2 else "SHA-256"}                                                                        
+generate_hash() {{                                                                                                                                              
   local input                                                                                                                                                   
   if [ -n "$1" ]; then input="$1"; else input=$(cat); fi                                                                                                        
-  if command -v sha256sum &>/dev/null; then echo -n "$input" | sha256sum | awk '{{print $1}}'                                                                   
-  elif command -v shasum &>/dev/null; then echo -n "$input" | shasum -a 256 | awk '{{print $1}}'                                                                
-  else echo -n "$input" | base64 | tr '/+' '_-' | tr -d '\\n'; fi                                                                                               
+  {hash_cmd}                                                                                                                                                    
 }}                                                                                                                                                              
                                                                                                                                                                 
 fzf_preview() {{                                                                                                                                                
@@ -130,27 +224,31 @@ fzf_preview() {{
      dim=${{FZF_PREVIEW_COLUMNS}}x$((FZF_PREVIEW_LINES - 1))                                                                                                    
   fi                                                                                                                                                            
                                                                                                                                                                 
-  if [ "$IMAGE_RENDERER" = "icat" ] || [ -n "$KITTY_WINDOW_ID" ]; then                                                                                          
-    if command -v kitten >/dev/null 2>&1; then                                                                                                                  
-      kitten icat --clear --transfer-mode=memory --unicode-placeholder --stdin=no --place="$dim@0x0" "$file" | sed "\\$d" | sed "$(printf "\\$s/\\$/\\033[m/")" 
-    elif command -v icat >/dev/null 2>&1; then                                                                                                                  
-      icat --clear --transfer-mode=memory --unicode-placeholder --stdin=no --place="$dim@0x0" "$file" | sed "\\$d" | sed "$(printf "\\$s/\\$/\\033[m/")"        
-    else                                                                                                                                                        
-      kitty icat --clear --transfer-mode=memory --unicode-placeholder --stdin=no --place="$dim@0x0" "$file" | sed "\\$d" | sed "$(printf "\\$s/\\$/\\033[m/")"  
-    fi                                                                                                                                                          
-  elif command -v chafa >/dev/null 2>&1; then                                                                                                                   
-    chafa -s "$dim" "$file"; echo                                                                                                                               
-  elif command -v imgcat >/dev/null; then                                                                                                                       
-    imgcat -W "${{dim%%x*}}" -H "${{dim##*x}}" "$file"                                                                                                          
-  else                                                                                                                                                          
-    echo "No image renderer found"                                                                                                                              
-  fi                                                                                                                                                            
+  # IMAGE_VIEWER is resolved by {CLI_NAME} when this script is generated                                                                                        
+  case "$IMAGE_VIEWER" in                                                                                                                                       
+    kitten|kitty)                                                                                                                                               
+      "$IMAGE_VIEWER" icat --clear --transfer-mode=memory --unicode-placeholder --stdin=no --place="$dim@0x0" "$file" | sed "\\$d" | sed "$(printf "\\$s/\\$/\\033[m/")" ;; 
+    icat)                                                                                                                                                       
+      icat --clear --transfer-mode=memory --unicode-placeholder --stdin=no --place="$dim@0x0" "$file" | sed "\\$d" | sed "$(printf "\\$s/\\$/\\033[m/")" ;;     
+    chafa)                                                                                                                                                      
+      chafa -s "$dim" "$file"; echo ;;                                                                                                                          
+    imgcat)                                                                                                                                                     
+      imgcat -W "${{dim%%x*}}" -H "${{dim##*x}}" "$file" ;;                                                                                                     
+    *)                                                                                                                                                          
+      echo "No image renderer found" ;;                                                                                                                         
+  esac                                                                                                                                                          
 }}                                                                                                                                                              
-export -f generate_sha256                                                                                                                                       
+# Horizontal rule across the preview pane, built in one printf instead of a per-column loop                                                                     
+hr() {{                                                                                                                                                         
+  local line                                                                                                                                                    
+  printf -v line '%*s' "${{FZF_PREVIEW_COLUMNS:-80}}" ''                                                                                                        
+  printf '%s\\n' "${{line// /─}}"                                                                                                                               
+}}                                                                                                                                                              
+export -f generate_hash                                                                                                                                         
+export -f hr                                                                                                                                                    
 export -f fzf_preview                                                                                                                                           
 """                                                                                                                                                             
-    with open(CLI_HELPER_SCRIPT, 'w') as f: f.write(helper_content)                                                                                             
-    os.chmod(CLI_HELPER_SCRIPT, 0o755)                                                                                                                          
+    write_script(CLI_HELPER_SCRIPT, helper_content)                                                                                                             
                                                                                                                                                                 
     # 2. Preview Dispatcher Script                                                                                                                              
     preview_content = f"""#!/usr/bin/env bash                                                                                                                   
@@ -161,28 +259,69 @@ if [ "$MODE" = "video" ]; then
   title="$SELECTION"                                                                                                                                            
   # Remove the numbering (e.g. "01 ") before hashing                                                                                                            
   clean_title=$(echo "$title" | sed -E 's/^[0-9]+ //g')                                                                                                         
-  id=$(generate_sha256 "$clean_title")                                                                                                                          
-  if [ -f "{CLI_PREVIEW_SCRIPTS_DIR}/${{id}}.txt" ]; then                                                                                                       
-    . "{CLI_PREVIEW_SCRIPTS_DIR}/${{id}}.txt"                                                                                                                   
+  id=$(generate_hash "$clean_title")                                                                                                                            
+  # Files are named <title hash>.<content hash>.txt                                                                                                             
+  previews=("{CLI_PREVIEW_SCRIPTS_DIR}/${{id}}".*.txt)                                                                                                          
+  if [ -f "${{previews[0]}}" ]; then                                                                                                                            
+    . "${{previews[0]}}"                                                                                                                                        
   else                                                                                                                                                          
     echo "Loading Preview..."                                                                                                                                   
   fi                                                                                                                                                            
 fi                                                                                                                                                              
 """                                                                                                                                                             
-    with open(CLI_PREVIEW_DISPATCHER, 'w') as f: f.write(preview_content)                                                                                       
-    os.chmod(CLI_PREVIEW_DISPATCHER, 0o755)                                                                                                                     
+    write_script(CLI_PREVIEW_DISPATCHER, preview_content)                                                                                                       
                                                                                                                                                                 
 def save_config():                                                                                                                                              
     """Writes the current CONFIG dictionary to file."""                                                                                                         
     try:                                                                                                                                                        
-        with open(CLI_CONFIG_FILE, 'w') as f:                                                                                                                   
-            for key, value in CONFIG.items():                                                                                                                   
-                f.write(f"{key}: {value}\n")                                                                                                                    
+        # Write a temp file and rename it over the config so readers never see a partial file                                                                   
+        tmp_file = CLI_CONFIG_FILE + ".tmp"                                                                                                                     
+        with open(tmp_file, 'w') as f:                                                                                                                          
+            f.write("".join(f"{key}: {value}\n" for key, value in CONFIG.items()))                                                                              
+        os.replace(tmp_file, CLI_CONFIG_FILE)                                                                                                                   
     except Exception as e:                                                                                                                                      
         sys.stderr.write(f"Warning: Could not save config: {e}\n")                                                                                              
                                                                                                                                                                 
+def queue_config_save():                                                                                                                                        
+    """Defers writing CONFIG to flush_config() so repeated toggles don't rewrite the file each time."""                                                         
+    global CONFIG_DIRTY                                                                                                                                         
+    CONFIG_DIRTY = True                                                                                                                                         
+                                                                                                                                                                
+def flush_config():                                                                                                                                             
+    """Writes CONFIG if it has changed since it was last saved."""                                                                                              
+    global CONFIG_DIRTY                                                                                                                                         
+    if CONFIG_DIRTY:                                                                                                                                            
+        CONFIG_DIRTY = False                                                                                                                                    
+        save_config()                                                                                                                                           
+                                                                                                                                                                
+def load_history():                                                                                                                                             
+    """Reads the search history file into HISTORY."""                                                                                                           
+    HISTORY.clear()                                                                                                                                             
+    try:                                                                                                                                                        
+        with open(CLI_SEARCH_HISTORY_FILE) as f: HISTORY.extend(l.strip() for l in f if l.strip())                                                              
+    except OSError: pass                                                                                                                                        
+                                                                                                                                                                
+def add_to_history(term):                                                                                                                                       
+    """Moves term to the most recent end of HISTORY; the file is written once by flush_history()."""                                                            
+    global HISTORY_DIRTY                                                                                                                                        
+    if term in HISTORY: HISTORY.remove(term)                                                                                                                    
+    HISTORY.append(term)                                                                                                                                        
+    HISTORY_DIRTY = True                                                                                                                                        
+                                                                                                                                                                
+def flush_history():                                                                                                                                            
+    """Writes HISTORY if a search has been added since it was last saved."""                                                                                    
+    global HISTORY_DIRTY                                                                                                                                        
+    if not HISTORY_DIRTY: return                                                                                                                                
+    HISTORY_DIRTY = False                                                                                                                                       
+    try:                                                                                                                                                        
+        tmp_file = CLI_SEARCH_HISTORY_FILE + ".tmp"                                                                                                             
+        with open(tmp_file, 'w') as f: f.write("".join(f"{term}\n" for term in HISTORY))                                                                        
+        os.replace(tmp_file, CLI_SEARCH_HISTORY_FILE)                                                                                                           
+    except Exception as e:                                                                                                                                      
+        sys.stderr.write(f"Warning: Could not save search history: {e}\n")                                                                                      
+                                                                                                                                                                
 def load_config():                                                                                                                                              
-    global CONFIG, PLAYLIST_END                                                                                                                                 
+    global CONFIG, PLAYLIST_END, RUNTIME_CONFIG                                                                                                                 
                                                                                                                                                                 
     # Ensure directories                                                                                                                                        
     for d in [CLI_CONFIG_DIR, CLI_PREVIEW_IMAGES_CACHE_DIR, CLI_PREVIEW_SCRIPTS_DIR]:                                                                           
@@ -214,7 +353,16 @@ def load_config():
     if not os.path.exists(CONFIG["DOWNLOAD_DIRECTORY"]):                                                                                                        
         os.makedirs(CONFIG["DOWNLOAD_DIRECTORY"], exist_ok=True)                                                                                                
                                                                                                                                                                 
-    PLAYLIST_END = int(CONFIG["NO_OF_SEARCH_RESULTS"])                                                                                                          
+    RUNTIME_CONFIG = RuntimeConfig(                                                                                                                             
+        page_size=int(CONFIG["NO_OF_SEARCH_RESULTS"]),                                                                                                          
+        audio_only=CONFIG["AUDIO_ONLY_MODE"].lower() == "true",                                                                                                 
+        autoplay=CONFIG["AUTOPLAY_MODE"],                                                                                                                       
+        quality=CONFIG["VIDEO_QUALITY"],                                                                                                                        
+        preview=CONFIG["ENABLE_PREVIEW"] == "true",                                                                                                             
+        selector=CONFIG["PREFERRED_SELECTOR"].lower(),                                                                                                          
+    )                                                                                                                                                           
+    PLAYLIST_END = RUNTIME_CONFIG.page_size                                                                                                                     
+    if not HISTORY: load_history() # Only once; later reloads would drop unsaved searches                                                                       
     create_bash_helpers()                                                                                                                                       
     cleanup_cache()                                                                                                                                             
                                                                                                                                                                 
@@ -231,26 +379,19 @@ def load_config():
     os.environ["IMAGE_RENDERER"] = CONFIG["IMAGE_RENDERER"]                                                                                                     
                                                                                                                                                                 
 def prompt(text, value=""):                                                                                                                                     
-    history_file = os.path.join(CLI_CACHE_DIR, "search_history.txt")                                                                                            
     history_text = ""                                                                                                                                           
-    if os.path.exists(history_file):                                                                                                                            
-        try:                                                                                                                                                    
-            with open(history_file, 'r') as f:                                                                                                                  
-                lines = [l.strip() for l in f if l.strip()]                                                                                                     
-            lines = lines[-10:]                                                                                                                                 
-            lines.reverse()                                                                                                                                     
-            history_formatted = "\n".join([f"{i+1}. {l}" for i, l in enumerate(lines)])                                                                         
-            history_text = f"Search history:\n{history_formatted}\n(Enter !<n> to select from history. Example: !1)\n"                                          
-        except Exception: pass                                                                                                                                  
-                                                                                                                                                                
-    if CONFIG["PREFERRED_SELECTOR"] == "rofi":                                                                                                                  
+    if HISTORY:                                                                                                                                                 
+        history_formatted = "\n".join([f"{i}. {HISTORY[-i]}" for i in range(1, min(10, len(HISTORY)) + 1)])                                                     
+        history_text = f"Search history:\n{history_formatted}\n(Enter !<n> to select from history. Example: !1)\n"                                              
+                                                                                                                                                                
+    if RUNTIME_CONFIG.selector == "rofi":                                                                                                                       
         cmd = ["rofi", "-dmenu", "-p", f"{text}: "]                                                                                                             
         if CONFIG["SEARCH_HISTORY"] == "true" and history_text:                                                                                                 
              cmd.extend(["-mesg", history_text])                                                                                                                
         proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)                                                                  
         out, _ = proc.communicate(input="")                                                                                                                     
         return out.strip()                                                                                                                                      
-    elif shutil.which("gum"):                                                                                                                                   
+    elif HAS_GUM:                                                                                                                                               
         if CONFIG["SEARCH_HISTORY"] == "true" and history_text: text += "\n" + history_text                                                                     
         cmd = ["gum", "input", "--header", "", "--prompt", f"{text}: ", "--value", value]                                                                       
         proc = subprocess.run(cmd, stdout=subprocess.PIPE, text=True)                                                                                           
@@ -262,15 +403,26 @@ def prompt(text, value=""):
         try: return input().strip()                                                                                                                             
         except EOFError: return ""                                                                                                                              
                                                                                                                                                                 
-def launcher(options_str, prompt_text, preview_mode=None):                                                                                                      
-    selector = CONFIG["PREFERRED_SELECTOR"].lower()                                                                                                             
-    if selector == "rofi":                                                                                                                                      
+def pipe_menu(cmd, options):                                                                                                                                    
+    """Runs a selector, streaming options to its stdin line by line, and returns its stdout."""                                                                 
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=-1)                                                          
+    try:                                                                                                                                                        
+        for option in options:                                                                                                                                  
+            proc.stdin.write(option)                                                                                                                            
+            proc.stdin.write("\n")                                                                                                                              
+    except BrokenPipeError: pass # Selector quit before reading everything                                                                                      
+    try: proc.stdin.close()                                                                                                                                     
+    except BrokenPipeError: pass                                                                                                                                
+    with proc.stdout: out = proc.stdout.read()                                                                                                                  
+    proc.wait()                                                                                                                                                 
+    return out                                                                                                                                                  
+                                                                                                                                                                
+def launcher(options, prompt_text, preview_mode=None):                                                                                                          
+    if RUNTIME_CONFIG.selector == "rofi":                                                                                                                       
         cmd = ["rofi", "-sort", "-matching", "fuzzy", "-dmenu", "-i", "-p", "", "-mesg", prompt_text, "-matching", "fuzzy", "-sorting-method", "fzf"]           
         if CONFIG.get("ROFI_THEME"): cmd[1:1] = ["-no-config", "-theme", CONFIG["ROFI_THEME"]]                                                                  
         else: cmd.extend(["-width", "1500"])                                                                                                                    
-        clean_options = re.sub(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])', '', options_str)                                                                       
-        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)                                                                  
-        out, _ = proc.communicate(input=clean_options)                                                                                                          
+        out = pipe_menu(cmd, (ANSI_ESCAPE_RE.sub('', option) for option in options))                                                                            
         res = out.strip()                                                                                                                                       
         return res if res else "Exit"                                                                                                                           
     else: # fzf                                                                                                                                                 
@@ -279,9 +431,7 @@ def launcher(options_str, prompt_text, preview_mode=None):
         if preview_mode:                                                                                                                                        
             cmd.extend(["--preview-window=left,35%,wrap", "--bind=right:accept", "--expect=shift-left,shift-right",                                             
                 "--tabstop=1", f"--preview=bash '{CLI_PREVIEW_DISPATCHER}' '{preview_mode}' {{}}"])                                                             
-        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)                                                                  
-        out, _ = proc.communicate(input=options_str)                                                                                                            
-        lines = out.splitlines()                                                                                                                                
+        lines = pipe_menu(cmd, options).splitlines()                                                                                                            
         if not lines: return ""                                                                                                                                 
         if preview_mode and len(lines) >= 2: return lines[1]                                                                                                    
         return lines[0]                                                                                                                                         
@@ -292,12 +442,9 @@ def run_yt_dlp(url, extra_args=None):
     if CONFIG["PREFERRED_BROWSER"]: cmd.extend(shlex.split(CONFIG["PREFERRED_BROWSER"]))                                                                        
     if extra_args: cmd.extend(extra_args)                                                                                                                       
                                                                                                                                                                 
-    if shutil.which("gum"):                                                                                                                                     
-        spin_cmd = ["gum", "spin", "--show-output", "--"] + cmd                                                                                                 
-        proc = subprocess.run(spin_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)                                                              
-    else:                                                                                                                                                       
-        sys.stderr.write("Loading...\n")                                                                                                                        
-        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)                                                                   
+    # yt-dlp's raw bytes go straight to the JSON parser: no spinner process in the pipe and no text decoding pass                                               
+    sys.stderr.write("Loading...\n")                                                                                                                            
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)                                                                               
                                                                                                                                                                 
     if proc.returncode != 0:                                                                                                                                    
         send_notification("Failed to fetch data. Check connection or update yt-dlp.")                                                                           
@@ -308,7 +455,7 @@ def run_yt_dlp(url, extra_args=None):
         # Attempt to recover JSON from mixed output                                                                                                             
         try:                                                                                                                                                    
             output = proc.stdout                                                                                                                                
-            json_start = output.find('{')                                                                                                                       
+            json_start = output.find(b'{')                                                                                                                      
             if json_start != -1:                                                                                                                                
                 return json.loads(output[json_start:])                                                                                                          
         except: pass                                                                                                                                            
@@ -316,106 +463,131 @@ def run_yt_dlp(url, extra_args=None):
         return None                                                                                                                                             
                                                                                                                                                                 
 # PREVIEW GENERATION                                                                                                                                            
+# Bucket boundaries in seconds, searched with bisect; UNITS[i] is (unit in seconds, label) for values below BOUNDS[i]                                           
+UPLOAD_AGE_BOUNDS = (60, 3600, 86400, 604800, 2635200, 31622400)                                                                                                
+UPLOAD_AGE_UNITS = ((1, "just now"), (60, "minutes ago"), (3600, "hours ago"), (86400, "days ago"),                                                             
+                    (604800, "weeks ago"), (2635200, "months ago"), (31622400, "years ago"))                                                                    
+DURATION_BOUNDS = (60, 3600)                                                                                                                                    
+DURATION_UNITS = ((1, "secs"), (60, "mins"), (3600, "hours"))                                                                                                   
+                                                                                                                                                                
+# Per-entry preview script, sourced by the dispatcher; compiled once instead of re-formatted per entry                                                          
+PREVIEW_TEMPLATE = string.Template("""                                                                                                                          
+if [ -f "$img" ];then fzf_preview "$img" 2>/dev/null;                                                                                                           
+else echo loading preview image...;                                                                                                                             
+fi                                                                                                                                                              
+hr                                                                                                                                                              
+echo $title                                                                                                                                                     
+hr                                                                                                                                                              
+echo "Channel: $channel"                                                                                                                                        
+echo "Duration: $duration"                                                                                                                                      
+echo "View Count: $views views"                                                                                                                                 
+echo "Live Status: $live"                                                                                                                                       
+echo "Uploaded: $uploaded"                                                                                                                                      
+hr                                                                                                                                                              
+! [ $desc = "null" ] && echo -n $desc;                                                                                                                          
+""")                                                                                                                                                            
+                                                                                                                                                                
 def generate_text_preview(data):                                                                                                                                
     if not data or "entries" not in data: return                                                                                                                
+    # Preview files are named <title hash>.<content hash>.txt, so a file that exists is already current                                                         
+    existing = {}                                                                                                                                               
+    with os.scandir(CLI_PREVIEW_SCRIPTS_DIR) as it:                                                                                                             
+        for e in it: existing.setdefault(e.name.split('.', 1)[0], set()).add(e.name)                                                                            
     for i, video in enumerate(data["entries"]):                                                                                                                 
         if not video: continue                                                                                                                                  
-        raw_title = video.get("title", "")                                                                                                                      
-        # Sanitize: remove newlines and leading numbers for hash consistency                                                                                    
-        clean_title = re.sub(r'^[0-9]+ ', '', raw_title).replace('\n', ' ')                                                                                     
-        filename_hash = generate_sha256(clean_title)                                                                                                            
+        # Read every field once up front                                                                                                                        
+        get = video.get                                                                                                                                         
+        raw_title, thumbs, vc, ls = get("title", ""), get("thumbnails") or (), get("view_count"), get("live_status")                                            
+        dur, ts, desc, ch = get("duration"), get("timestamp"), get("description") or "null", get("channel", "")                                                 
                                                                                                                                                                 
-        # Safe quoting for bash injection                                                                                                                       
-        safe_title = shlex.quote(clean_title)                                                                                                                   
-                                                                                                                                                                
-        thumbs = video.get("thumbnails", [])                                                                                                                    
-        thumb_url = thumbs[-1]["url"] if thumbs else ""                                                                                                         
-        preview_image_hash = generate_sha256(thumb_url)                                                                                                         
+        # Sanitize: remove newlines and leading numbers for hash consistency                                                                                    
+        clean_title = strip_numbering(raw_title).replace('\n', ' ')                                                                                             
+        filename_hash = generate_hash(clean_title)                                                                                                              
                                                                                                                                                                 
-        vc = video.get("view_count")                                                                                                                            
-        view_count = "{:,}".format(int(vc)) if vc is not None else "Unknown"                                                                                    
-        ls = video.get("live_status")                                                                                                                           
+        view_count = f"{int(vc):,}" if vc is not None else "Unknown"                                                                                            
         live_status = "Online" if ls == "is_live" else ("Offline" if ls == "was_live" else "False")                                                             
                                                                                                                                                                 
-        desc = video.get("description") or "null"                                                                                                               
-        safe_description = shlex.quote(desc.replace('\n', ' ').replace('\r', ' '))                                                                              
-        safe_channel = shlex.quote(video.get("channel", ""))                                                                                                    
-                                                                                                                                                                
-        dur = video.get("duration")                                                                                                                             
         duration_str = "Unknown"                                                                                                                                
         if dur:                                                                                                                                                 
             try:                                                                                                                                                
                 dur = float(dur)                                                                                                                                
-                if dur >= 3600: duration_str = f"{int(dur // 3600)} hours"                                                                                      
-                elif dur >= 60: duration_str = f"{int(dur // 60)} mins"                                                                                         
-                else: duration_str = f"{int(dur)} secs"                                                                                                         
+                unit, label = DURATION_UNITS[bisect.bisect_right(DURATION_BOUNDS, dur)]                                                                         
+                duration_str = f"{int(dur // unit)} {label}"                                                                                                    
             except: pass                                                                                                                                        
                                                                                                                                                                 
-        ts = video.get("timestamp")                                                                                                                             
         timestamp_str = ""                                                                                                                                      
         if ts:                                                                                                                                                  
             try:                                                                                                                                                
                 diff = CURRENT_TIME - int(ts)                                                                                                                   
-                if diff < 60: timestamp_str = "just now"                                                                                                        
-                elif diff < 3600: timestamp_str = f"{diff // 60} minutes ago"                                                                                   
-                elif diff < 86400: timestamp_str = f"{diff // 3600} hours ago"                                                                                  
-                elif diff < 604800: timestamp_str = f"{diff // 86400} days ago"                                                                                 
-                elif diff < 2635200: timestamp_str = f"{diff // 604800} weeks ago"                                                                              
-                elif diff < 31622400: timestamp_str = f"{diff // 2635200} months ago"                                                                           
-                else: timestamp_str = f"{diff // 31622400} years ago"                                                                                           
+                bucket = bisect.bisect_right(UPLOAD_AGE_BOUNDS, diff)                                                                                           
+                unit, label = UPLOAD_AGE_UNITS[bucket]                                                                                                          
+                timestamp_str = f"{diff // unit} {label}" if bucket else label                                                                                  
             except: pass                                                                                                                                        
                                                                                                                                                                 
-        content = f"""                                                                                                                                          
-if [ -f "{CLI_PREVIEW_IMAGES_CACHE_DIR}/{preview_image_hash}.jpg" ];then fzf_preview "{CLI_PREVIEW_IMAGES_CACHE_DIR}/{preview_image_hash}.jpg" 2>/dev/null;     
-else echo loading preview image...;                                                                                                                             
-fi                                                                                                                                                              
-ll=1                                                                                                                                                            
-while [ $ll -le $FZF_PREVIEW_COLUMNS ];do echo -n -e "─" ;(( ll++ ));done;                                                                                      
-echo                                                                                                                                                            
-echo {safe_title}                                                                                                                                               
-ll=1                                                                                                                                                            
-while [ $ll -le $FZF_PREVIEW_COLUMNS ];do echo -n -e "─" ;(( ll++ ));done;                                                                                      
-echo "Channel: {safe_channel}"                                                                                                                                  
-echo "Duration: {duration_str}"                                                                                                                                 
-echo "View Count: {view_count} views"                                                                                                                           
-echo "Live Status: {live_status}"                                                                                                                               
-echo "Uploaded: {timestamp_str}"                                                                                                                                
-ll=1                                                                                                                                                            
-while [ $ll -le $FZF_PREVIEW_COLUMNS ];do echo -n -e "─" ;(( ll++ ));done;                                                                                      
-echo                                                                                                                                                            
-! [ {safe_description} = "null" ] && echo -n {safe_description};                                                                                                
-"""                                                                                                                                                             
-        with open(os.path.join(CLI_PREVIEW_SCRIPTS_DIR, f"{filename_hash}.txt"), "w") as f: f.write(content)                                                    
+        # Hash the strings the script actually shows, so a relative upload age that has moved on forces a rewrite                                               
+        thumb_url = thumbs[-1]["url"] if thumbs else ""                                                                                                         
+        source = (clean_title, ch, desc, duration_str, view_count, live_status, timestamp_str, thumb_url)                                                       
+        content_hash = hashlib.blake2b(repr(source).encode('utf-8'), digest_size=8).hexdigest()                                                                 
+        preview_name = f"{filename_hash}.{content_hash}.txt"                                                                                                    
+        stale = existing.get(filename_hash, ())                                                                                                                 
+        if preview_name in stale: continue # Already rendered from the same metadata                                                                            
+                                                                                                                                                                
+        # Safe quoting for bash injection                                                                                                                       
+        safe_title = shlex.quote(clean_title)                                                                                                                   
+        preview_image_hash = generate_hash(thumb_url)                                                                                                           
+                                                                                                                                                                
+        safe_description = shlex.quote(desc.replace('\n', ' ').replace('\r', ' '))                                                                              
+        safe_channel = shlex.quote(ch)                                                                                                                          
+                                                                                                                                                                
+        content = PREVIEW_TEMPLATE.substitute(                                                                                                                  
+            img=f"{CLI_PREVIEW_IMAGES_CACHE_DIR}/{preview_image_hash}.jpg", title=safe_title, channel=safe_channel,                                             
+            duration=duration_str, views=view_count, live=live_status, uploaded=timestamp_str, desc=safe_description)                                           
+        with open(os.path.join(CLI_PREVIEW_SCRIPTS_DIR, preview_name), "w") as f: f.write(content)                                                              
+        for name in stale:                                                                                                                                      
+            try: os.remove(os.path.join(CLI_PREVIEW_SCRIPTS_DIR, name))                                                                                         
+            except OSError: pass                                                                                                                                
                                                                                                                                                                 
 def download_preview_images(data, prefix=""):                                                                                                                   
     if not data or "entries" not in data: return                                                                                                                
-    generate_text_preview(data)                                                                                                                                 
+    # A page's signature is derived from its video IDs, so revisiting it after Next/Previous skips the text previews                                            
+    page_sig = hashlib.blake2b(b"|".join((e.get("id") or "").encode() for e in data["entries"] if e), digest_size=8).hexdigest()                                
+    if page_sig in RENDERED_PAGES:                                                                                                                              
+        RENDERED_PAGES.remove(page_sig)                                                                                                                         
+    else:                                                                                                                                                       
+        generate_text_preview(data)                                                                                                                             
+    RENDERED_PAGES.append(page_sig) # Only recorded once rendering succeeded                                                                                    
+                                                                                                                                                                
+    # Always re-check thumbnails: a previous fire-and-forget curl may have failed                                                                               
     previews_file = os.path.join(CLI_PREVIEW_IMAGES_CACHE_DIR, "previews.txt")                                                                                  
     if os.path.exists(previews_file): os.remove(previews_file)                                                                                                  
-    entries_to_download = []                                                                                                                                    
+    # Keyed by URL so a thumbnail listed twice on a page is only checked and fetched once                                                                       
+    entries_to_download = {}                                                                                                                                    
     for video in data["entries"]:                                                                                                                               
         if not video: continue                                                                                                                                  
         thumbs = video.get("thumbnails", [])                                                                                                                    
         if not thumbs: continue                                                                                                                                 
         url = thumbs[-1]["url"]                                                                                                                                 
-        filename = generate_sha256(url)                                                                                                                         
+        if url in entries_to_download: continue                                                                                                                 
+        filename = generate_hash(url)                                                                                                                           
         if not os.path.exists(os.path.join(CLI_PREVIEW_IMAGES_CACHE_DIR, f"{filename}.jpg")):                                                                   
-            entries_to_download.append((url, filename))                                                                                                         
+            entries_to_download[url] = filename                                                                                                                 
                                                                                                                                                                 
     if entries_to_download:                                                                                                                                     
         with open(previews_file, "w") as f:                                                                                                                     
-            for url, filename in entries_to_download:                                                                                                           
-                f.write(f'url = "{prefix}{url}"\n')                                                                                                             
-                f.write(f'output = "{CLI_PREVIEW_IMAGES_CACHE_DIR}/{filename}.jpg"\n')                                                                          
-        subprocess.Popen(["curl", "-s", "-K", previews_file], stderr=subprocess.DEVNULL, stdout=subprocess.DEVNULL)                                             
+            f.write("".join(f'url = "{prefix}{url}"\noutput = "{CLI_PREVIEW_IMAGES_CACHE_DIR}/{filename}.jpg"\n'                                                
+                            for url, filename in entries_to_download.items()))                                                                                  
+        # --parallel lets curl multiplex every thumbnail over one HTTP/2 connection to i.ytimg.com                                                              
+        spawn(["curl", "-s", "--parallel", "--parallel-max", "30", "-K", previews_file],                                                                        
+            stderr=subprocess.DEVNULL, stdout=subprocess.DEVNULL)                                                                                               
                                                                                                                                                                 
 # CORE LOGIC                                                                                                                                                    
 def playlist_explorer(search_results, url):                                                                                                                     
-    global PLAYLIST_START, PLAYLIST_END                                                                                                                         
+    global PLAYLIST_START, PLAYLIST_END, RUNTIME_CONFIG                                                                                                         
                                                                                                                                                                 
     # Load persistent state                                                                                                                                     
-    audio_only_mode = CONFIG["AUDIO_ONLY_MODE"].lower() == "true"                                                                                               
-    autoplay_mode = CONFIG["AUTOPLAY_MODE"]                                                                                                                     
+    audio_only_mode = RUNTIME_CONFIG.audio_only                                                                                                                 
+    autoplay_mode = RUNTIME_CONFIG.autoplay                                                                                                                     
+    page_size = RUNTIME_CONFIG.page_size                                                                                                                        
                                                                                                                                                                 
     download_images = False                                                                                                                                     
                                                                                                                                                                 
@@ -436,32 +608,30 @@ def playlist_explorer(search_results, url):
             for entry in entries:                                                                                                                               
                 if entry: titles.append(entry.get("title", "").replace('\n', ' '))                                                                              
                                                                                                                                                                 
-        if CONFIG["ENABLE_PREVIEW"] == "true" and CONFIG["PREFERRED_SELECTOR"] == "fzf" and not download_images:                                                
+        if RUNTIME_CONFIG.preview and RUNTIME_CONFIG.selector == "fzf" and not download_images:                                                                 
             download_preview_images(search_results)                                                                                                             
             download_images = True                                                                                                                              
                                                                                                                                                                 
-        if CONFIG["ENABLE_PREVIEW"] == "true":                                                                                                                  
-            options_str = "\n".join(titles) + f"\nNext\nPrevious\nBack\nExit"                                                                                   
-            selection = launcher(options_str, "select video", "video")                                                                                          
+        titles.extend(["Next", "Previous", "Back", "Exit"])                                                                                                     
+        if RUNTIME_CONFIG.preview:                                                                                                                              
+            selection = launcher(titles, "select video", "video")                                                                                               
         else:                                                                                                                                                   
-            options_str = "\n".join(titles + ["Next", "Previous", "Back", "Exit"])                                                                              
-            selection = launcher(options_str, "select video")                                                                                                   
+            selection = launcher(titles, "select video")                                                                                                        
                                                                                                                                                                 
-        selection = re.sub(r'^[^0-9]*  ', '', selection)                                                                                                        
+        selection = NON_NUM_PREFIX_RE.sub('', selection)                                                                                                        
         clear_screen()                                                                                                                                          
                                                                                                                                                                 
         if selection == "Next":                                                                                                                                 
-            PLAYLIST_START += int(CONFIG["NO_OF_SEARCH_RESULTS"])                                                                                               
-            PLAYLIST_END += int(CONFIG["NO_OF_SEARCH_RESULTS"])                                                                                                 
+            PLAYLIST_START += page_size                                                                                                                         
+            PLAYLIST_END += page_size                                                                                                                           
             search_results = run_yt_dlp(url)                                                                                                                    
             download_images = False                                                                                                                             
             continue                                                                                                                                            
         elif selection == "Previous":                                                                                                                           
-            PLAYLIST_START -= int(CONFIG["NO_OF_SEARCH_RESULTS"])                                                                                               
+            PLAYLIST_START -= page_size                                                                                                                         
             if PLAYLIST_START <= 0: PLAYLIST_START = 1                                                                                                          
-            PLAYLIST_END -= int(CONFIG["NO_OF_SEARCH_RESULTS"])                                                                                                 
-            min_end = int(CONFIG["NO_OF_SEARCH_RESULTS"])                                                                                                       
-            if PLAYLIST_END < min_end: PLAYLIST_END = min_end                                                                                                   
+            PLAYLIST_END -= page_size                                                                                                                           
+            if PLAYLIST_END < page_size: PLAYLIST_END = page_size                                                                                               
             search_results = run_yt_dlp(url)                                                                                                                    
             download_images = False                                                                                                                             
             continue                                                                                                                                            
@@ -473,7 +643,7 @@ def playlist_explorer(search_results, url):
             sel_id = int(selection.split(' ')[0])                                                                                                               
             current_index = sel_id - 1                                                                                                                          
             video = entries[current_index]                                                                                                                      
-            clean_title = re.sub(r'^[0-9]+ ', '', video['title'])                                                                                               
+            clean_title = strip_numbering(video['title'])                                                                                                       
         except (ValueError, IndexError): continue                                                                                                               
                                                                                                                                                                 
         # Action Menu Loop                                                                                                                                      
@@ -492,7 +662,7 @@ def playlist_explorer(search_results, url):
                 f"Back", f"Exit"                                                                                                                                
             ]                                                                                                                                                   
                                                                                                                                                                 
-            action_sel = launcher("\n".join(media_actions), "Select Media Action")                                                                              
+            action_sel = launcher(media_actions, "Select Media Action")                                                                                         
             clear_screen()                                                                                                                                      
                                                                                                                                                                 
             if action_sel == "Exit": byebye()                                                                                                                   
@@ -500,16 +670,18 @@ def playlist_explorer(search_results, url):
                                                                                                                                                                 
             if "Toggle Audio Only" in action_sel:                                                                                                               
                 audio_only_mode = not audio_only_mode                                                                                                           
+                RUNTIME_CONFIG = RUNTIME_CONFIG._replace(audio_only=audio_only_mode)                                                                            
                 CONFIG["AUDIO_ONLY_MODE"] = str(audio_only_mode).lower()                                                                                        
-                save_config()                                                                                                                                   
+                queue_config_save()                                                                                                                             
                 continue                                                                                                                                        
                                                                                                                                                                 
             if "Toggle Autoplay" in action_sel:                                                                                                                 
                 modes = ["off", "playlist", "related"]                                                                                                          
                 curr_idx = modes.index(autoplay_mode)                                                                                                           
                 autoplay_mode = modes[(curr_idx + 1) % len(modes)]                                                                                              
+                RUNTIME_CONFIG = RUNTIME_CONFIG._replace(autoplay=autoplay_mode)                                                                                
                 CONFIG["AUTOPLAY_MODE"] = autoplay_mode                                                                                                         
-                save_config()                                                                                                                                   
+                queue_config_save()                                                                                                                             
                 continue                                                                                                                                        
                                                                                                                                                                 
             vid_url = video.get("url")                                                                                                                          
@@ -523,9 +695,9 @@ def playlist_explorer(search_results, url):
                     if CONFIG["PLAYER"] == "mpv":                                                                                                               
                         if audio_only_mode:                                                                                                                     
                             player_cmd.extend(["--no-video", "--force-window=no"])                                                                              
-                        elif CONFIG["VIDEO_QUALITY"].isdigit():                                                                                                 
+                        elif RUNTIME_CONFIG.quality.isdigit():                                                                                                  
                             # FIX 1: Apply format selection to MPV                                                                                              
-                            q = CONFIG["VIDEO_QUALITY"]                                                                                                         
+                            q = RUNTIME_CONFIG.quality                                                                                                          
                             player_cmd.append(f"--ytdl-format=bestvideo[height<={q}]+bestaudio/best[height<={q}]/best")                                         
                                                                                                                                                                 
                     elif CONFIG["PLAYER"] == "vlc":                                                                                                             
@@ -553,8 +725,8 @@ def playlist_explorer(search_results, url):
                         current_index += 1                                                                                                                      
                         if current_index >= len(entries):                                                                                                       
                             print("End of current list. Fetching next page...")                                                                                 
-                            PLAYLIST_START += int(CONFIG["NO_OF_SEARCH_RESULTS"])                                                                               
-                            PLAYLIST_END += int(CONFIG["NO_OF_SEARCH_RESULTS"])                                                                                 
+                            PLAYLIST_START += page_size                                                                                                         
+                            PLAYLIST_END += page_size                                                                                                           
                             search_results = run_yt_dlp(url)                                                                                                    
                             if not search_results or "entries" not in search_results: break                                                                     
                             entries = search_results.get("entries", [])                                                                                         
@@ -564,7 +736,7 @@ def playlist_explorer(search_results, url):
                         if current_index < len(entries):                                                                                                        
                             video = entries[current_index]                                                                                                      
                             vid_url = video.get("url")                                                                                                          
-                            clean_title = re.sub(r'^[0-9]+ ', '', video.get("title", "Unknown"))                                                                
+                            clean_title = strip_numbering(video.get("title", "Unknown"))                                                                        
                         else: break                                                                                                                             
                                                                                                                                                                 
                     elif autoplay_mode == "related":                                                                                                            
@@ -575,7 +747,7 @@ def playlist_explorer(search_results, url):
                                   "--playlist-start", "1", "--playlist-end", "5"]                                                                               
                         if CONFIG["PREFERRED_BROWSER"]: mix_cmd.extend(shlex.split(CONFIG["PREFERRED_BROWSER"]))                                                
                                                                                                                                                                 
-                        proc = subprocess.run(mix_cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)                                            
+                        proc = subprocess.run(mix_cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)                                                       
                         try:                                                                                                                                    
                             mix_data = json.loads(proc.stdout)                                                                                                  
                             found_next = False                                                                                                                  
@@ -603,7 +775,7 @@ def playlist_explorer(search_results, url):
                 if audio_only_mode:                                                                                                                             
                     ext_args = ["-x", "-f", "bestaudio", "--audio-format", "mp3"]                                                                               
                 else:                                                                                                                                           
-                    q = CONFIG["VIDEO_QUALITY"]                                                                                                                 
+                    q = RUNTIME_CONFIG.quality                                                                                                                  
                     ext_args = ["-f", f"bestvideo[height<={q}]+bestaudio/best[height<={q}]/best"] if q.isdigit() else []                                        
                                                                                                                                                                 
                 out_tmpl = os.path.join(CONFIG["DOWNLOAD_DIRECTORY"], f"{folder}/individual/%(channel)s/%(title)s.%(ext)s")                                     
@@ -611,11 +783,11 @@ def playlist_explorer(search_results, url):
                 cmd = ["yt-dlp", vid_url, "--output", out_tmpl] + ext_args                                                                                      
                 if CONFIG["PREFERRED_BROWSER"]: cmd.extend(shlex.split(CONFIG["PREFERRED_BROWSER"]))                                                            
                                                                                                                                                                 
-                subprocess.Popen(cmd, start_new_session=True)                                                                                                   
+                spawn(cmd)                                                                                                                                      
                 send_notification(f"Started downloading {clean_title}")                                                                                         
                                                                                                                                                                 
     PLAYLIST_START = 1                                                                                                                                          
-    PLAYLIST_END = int(CONFIG["NO_OF_SEARCH_RESULTS"])                                                                                                          
+    PLAYLIST_END = page_size                                                                                                                                    
                                                                                                                                                                 
 def main_menu(initial_action=None, search_term=None):                                                                                                           
     clear_screen()                                                                                                                                              
@@ -626,8 +798,8 @@ def main_menu(initial_action=None, search_term=None):
             f"Edit Config",                                                                                                                                     
             f"Exit"                                                                                                                                             
         ]                                                                                                                                                       
-        sel = launcher("\n".join(options), "Select Action")                                                                                                     
-        action = re.sub(r'.*  ', '', sel)                                                                                                                       
+        sel = launcher(options, "Select Action")                                                                                                                
+        action = MENU_PREFIX_RE.sub('', sel)                                                                                                                    
                                                                                                                                                                 
     if action == "Exit": byebye()                                                                                                                               
                                                                                                                                                                 
@@ -635,19 +807,14 @@ def main_menu(initial_action=None, search_term=None):
         clear_screen()                                                                                                                                          
         if not search_term:                                                                                                                                     
             search_term = prompt("Enter term to search for")                                                                                                    
-            if re.match(r'^![0-9]{1,2}$', search_term):                                                                                                         
+            if HISTORY_REF_RE.match(search_term):                                                                                                               
                 idx = int(search_term[1:])                                                                                                                      
-                hist_file = os.path.join(CLI_CACHE_DIR, "search_history.txt")                                                                                   
-                if os.path.exists(hist_file):                                                                                                                   
-                    try:                                                                                                                                        
-                        with open(hist_file) as f: lines = [l.strip() for l in f if l.strip()]                                                                  
-                        if lines and idx <= 10: search_term = lines[-idx]                                                                                       
-                    except Exception: pass                                                                                                                      
+                if 0 < idx <= min(10, len(HISTORY)): search_term = HISTORY[-idx]                                                                                
                                                                                                                                                                 
         if not search_term: return main_menu()                                                                                                                  
                                                                                                                                                                 
         sp = "EgIQAQ%253D%253D" # Default video                                                                                                                 
-        match = re.match(r'^(:[a-z]+)\s+(.+)', search_term)                                                                                                     
+        match = FILTER_CMD_RE.match(search_term)                                                                                                                
         if match:                                                                                                                                               
             filter_cmd, search_term = match.groups()                                                                                                            
             if filter_cmd == ":hour": sp="EgIIAQ%253D%253D"                                                                                                     
@@ -656,27 +823,21 @@ def main_menu(initial_action=None, search_term=None):
             elif filter_cmd == ":month": sp="EgIIBA%253D%253D"                                                                                                  
             elif filter_cmd == ":year": sp="EgIIBQ%253D%253D"                                                                                                   
                                                                                                                                                                 
-        if CONFIG["SEARCH_HISTORY"] == "true":                                                                                                                  
-            hist_file = os.path.join(CLI_CACHE_DIR, "search_history.txt")                                                                                       
-            lines = []                                                                                                                                          
-            if os.path.exists(hist_file):                                                                                                                       
-                try:                                                                                                                                            
-                    with open(hist_file) as f: lines = [l.strip() for l in f if l.strip() and l.strip() != search_term]                                         
-                except Exception: pass                                                                                                                          
-            lines.append(search_term)                                                                                                                           
-            with open(hist_file, 'w') as f: f.write("\n".join(lines) + "\n")                                                                                    
-                                                                                                                                                                
-        term_enc = urllib.parse.quote(search_term)                                                                                                              
+        if CONFIG["SEARCH_HISTORY"] == "true": add_to_history(search_term)                                                                                      
+                                                                                                                                                                
+        term_enc = urllib_parse.quote(search_term)                                                                                                              
         url = f"https://www.youtube.com/results?search_query={term_enc}&sp={sp}"                                                                                
         playlist_explorer(run_yt_dlp(url), url)                                                                                                                 
                                                                                                                                                                 
     elif action == "Edit Config":                                                                                                                               
+        flush_config() # The editor must see pending toggles                                                                                                    
         subprocess.run([CONFIG["EDITOR"], CLI_CONFIG_FILE])                                                                                                     
         load_config()                                                                                                                                           
                                                                                                                                                                 
     main_menu()                                                                                                                                                 
                                                                                                                                                                 
 if __name__ == "__main__":                                                                                                                                      
+    import argparse                                                                                                                                             
     parser = argparse.ArgumentParser(description=f"Browse youtube from the terminal ({CLI_NAME})")                                                              
     parser.add_argument("-S", "--search", help="search for a video")                                                                                            
     parser.add_argument("-e", "--edit-config", action="store_true", help="edit config file")                                                                    
@@ -687,8 +848,13 @@ if __name__ == "__main__":
         print(f"{CLI_NAME} v{CLI_VERSION}")                                                                                                                     
         sys.exit(0)                                                                                                                                             
                                                                                                                                                                 
-    check_dependencies()                                                                                                                                        
     load_config()                                                                                                                                               
+    check_dependencies()                                                                                                                                        
+    atexit.register(flush_config)                                                                                                                               
+    atexit.register(flush_history)                                                                                                                              
+    # Exit cleanly on hangup/termination so atexit handlers still run                                                                                           
+    for sig in ("SIGHUP", "SIGTERM"):                                                                                                                           
+        if hasattr(signal, sig): signal.signal(getattr(signal, sig), lambda *_: sys.exit(1))                                                                    
                                                                                                                                                                 
     if args.edit_config:                                                                                                                                        
         subprocess.run([CONFIG["EDITOR"], CLI_CONFIG_FILE])                                                                                                     